@@ -11,8 +11,10 @@ from flask_cors import CORS
 from api.exceptions.notfound import NotFoundException
 
 from .exceptions.badrequest import BadRequestException
+from .exceptions.unavailable import ServiceUnavailableException
 from .exceptions.validation import ValidationException
 
+from .dao.movies import MovieDAO, close_thread_session
 from .neo4j import init_driver
 
 from .routes.auth import auth_routes
@@ -49,12 +51,16 @@ def create_app(test_config=None):
         pass
 
     with app.app_context():
-        init_driver(
+        driver = init_driver(
             app.config.get('NEO4J_URI'),
             app.config.get('NEO4J_USERNAME'),
             app.config.get('NEO4J_PASSWORD'),
         )
 
+        # Make sure the constraints and indexes the DAO queries rely
+        # on exist before serving traffic
+        MovieDAO(driver).ensure_indexes()
+
     # JWT
     jwt = JWTManager(app)
 
@@ -70,6 +76,9 @@ def create_app(test_config=None):
     app.register_blueprint(people_routes)
     app.register_blueprint(status_routes)
 
+    # Close the per-thread Neo4j session cached by the DAOs
+    app.teardown_request(close_thread_session)
+
     # Serve all other routes as static
     @app.route('/', methods=['GET'])
     def index():
@@ -91,6 +100,10 @@ def create_app(test_config=None):
     def handle_not_found_exception(err):
         return {"message": str(err)}, 404
 
+    @app.errorhandler(ServiceUnavailableException)
+    def handle_service_unavailable_exception(err):
+        return {"message": str(err)}, 503
+
 
 
     return app
@@ -1,4 +1,5 @@
 from api.data import popular, goodfellas
+from api.dao.movies import invalidate_favorites
 from api.exceptions.notfound import NotFoundException
 
 
@@ -83,7 +84,12 @@ class FavoriteDAO:
 
         # Execute the transaction function within a Write Transaction
         with self.driver.session() as session:
-            return session.execute_write(add_to_favorites, user_id, movie_id)
+            movie = session.execute_write(add_to_favorites, user_id, movie_id)
+
+        # Drop the cached favorites so reads see the new entry
+        invalidate_favorites(user_id)
+
+        return movie
         # TODO: Return movie details and `favorite` property
 
         # return {
@@ -124,8 +130,14 @@ class FavoriteDAO:
 
         # Execute the transaction function within a Write Transaction
         with self.driver.session() as session:
-            # Return movie details and `favorite` property
-            return session.execute_write(remove_from_favorites, user_id, movie_id)
+            movie = session.execute_write(remove_from_favorites, user_id,
+                                          movie_id)
+
+        # Drop the cached favorites so reads see the removal
+        invalidate_favorites(user_id)
+
+        # Return movie details and `favorite` property
+        return movie
 
         # TODO: Return movie details and `favorite` property
 
@@ -1,6 +1,36 @@
+import textwrap
+import threading
+
+import cachetools
+
+from api.dao.movies import _read
 from api.data import genres
 from api.exceptions.notfound import NotFoundException
 
+# The genre list barely changes, so the whole response is cached
+# in-process for five minutes and repeat requests never reach Neo4j.
+_GENRES_CACHE = cachetools.TTLCache(maxsize=1, ttl=300)
+_GENRES_LOCK = threading.Lock()
+
+# One aggregation computes the movie count and highest-rated poster
+# for every genre, instead of running a poster subquery per genre.
+_ALL_QUERY = textwrap.dedent("""
+    MATCH (g:Genre)
+    WHERE g.name <> '(no genres listed)'
+    OPTIONAL MATCH (g)<-[:IN_GENRE]-(m:Movie)
+    WHERE m.imdbRating IS NOT NULL AND m.poster IS NOT NULL
+    WITH g, m
+    ORDER BY m.imdbRating DESC
+    WITH g, collect(m.poster)[0] AS poster, count(m) AS movies
+    RETURN g {
+        .name,
+        movies: movies,
+        poster: poster
+    } AS genre
+    ORDER BY g.name ASC
+""").strip()
+
+
 class GenreDAO:
     """
     The constructor expects an instance of the Neo4j Driver, which will be
@@ -25,11 +55,25 @@ class GenreDAO:
     """
     # tag::all[]
     def all(self):
-        # TODO: Open a new session
-        # TODO: Define a unit of work to Get a list of Genres
-        # TODO: Execute within a Read Transaction
+        # Serve the cached list while it is fresh.  The cache holds a
+        # tuple and every caller gets a fresh list, so in-place
+        # mutations (e.g. sorting) cannot poison later requests.
+        with _GENRES_LOCK:
+            if "all" in _GENRES_CACHE:
+                return list(_GENRES_CACHE["all"])
+
+        # Define a unit of work to Get a list of Genres
+        def get_genres(tx):
+            return tx.run(_ALL_QUERY).value("genre")
+
+        # Open a new session and execute within a Read Transaction
+        with self.driver.session() as session:
+            output = _read(session, get_genres, op="genres.all")
+
+        with _GENRES_LOCK:
+            _GENRES_CACHE["all"] = tuple(output)
 
-        return genres
+        return output
     # end::all[]
 
 
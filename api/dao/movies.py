@@ -1,6 +1,396 @@
-from api.data import popular, goodfellas
-import os
+from api.data import popular
+import base64
+import json
+import textwrap
+import threading
+
+import cachetools
+from neo4j import unit_of_work
+from neo4j.exceptions import ClientError
+
+from api.exceptions.badrequest import BadRequestException
 from api.exceptions.notfound import NotFoundException
+from api.exceptions.unavailable import ServiceUnavailableException
+
+# Every read transaction is bounded so a badly-behaved query cannot
+# hold a pooled connection indefinitely and starve other requests; the
+# metadata tags the query in SHOW TRANSACTIONS for diagnosis.
+_TX_TIMEOUT = 2.0
+
+
+def _read(session, work, *args, op=None, **kwargs):
+    """Run `work` as a read transaction with the default timeout and
+    query metadata.  A transaction terminated by the server -- for
+    example after exceeding the timeout -- surfaces as a 503 via
+    ServiceUnavailableException instead of a generic 500."""
+    bounded = unit_of_work(
+        timeout=_TX_TIMEOUT,
+        metadata={"app": "movies", "op": op})(work)
+
+    try:
+        return session.execute_read(bounded, *args, **kwargs)
+    except ClientError as exception:
+        if exception.code is not None and \
+                exception.code.startswith("Neo.ClientError.Transaction."):
+            raise ServiceUnavailableException(
+                "Query was cancelled or timed out, please retry")
+        raise
+
+
+# `get_user_favorites` runs on every page view for an authenticated
+# user and returns a small, slow-changing list, so the result is cached
+# per user for a short window.  The cache lives at module level because
+# a fresh MovieDAO is constructed for each request.
+_FAVORITES_CACHE = cachetools.TTLCache(maxsize=10_000, ttl=60)
+_FAVORITES_LOCK = threading.Lock()
+
+# Hot DAO methods reuse one session per thread instead of constructing
+# a fresh session object on every call.  execute_read hands the
+# underlying connection back to the pool as soon as it completes, so a
+# lingering session object holds no connection; the object itself is
+# closed by the teardown hook registered in `create_app`.
+_THREAD_SESSIONS = threading.local()
+
+
+def close_thread_session(exc=None):
+    """Close the session cached for the calling thread, if any.
+    Registered as a Flask `teardown_request` hook in `create_app`."""
+    entry = getattr(_THREAD_SESSIONS, "entry", None)
+    if entry is not None:
+        _THREAD_SESSIONS.entry = None
+        entry[1].close()
+
+
+def invalidate_favorites(user_id):
+    """Drop the cached favorites for a user.  Called whenever their
+    "My Favorites" list is mutated so reads never see stale entries."""
+    with _FAVORITES_LOCK:
+        _FAVORITES_CACHE.pop(user_id, None)
+
+
+# Sortable properties and directions accepted by the movie list
+# endpoints.  The Cypher for every combination is built once at import
+# time, so each request sends identical query text to the server and
+# hits the query plan cache instead of forcing a re-plan.  Anything not
+# in this table is rejected, so user-supplied sort/order values never
+# reach the query text.
+MOVIE_SORTS = ("title", "released", "imdbRating")
+SORT_ORDERS = ("ASC", "DESC")
+
+# Properties projected for a movie card by default.  `m { .* }` would
+# ship every property on every node over Bolt -- including long plot
+# strings the listing UI never shows -- so the default is the minimal
+# set the cards render.  Callers can opt in to extra fields from the
+# whitelist below via the `fields` kwarg.
+MOVIE_FIELDS = ("tmdbId", "title", "year", "poster", "imdbRating")
+
+_PROJECTABLE_FIELDS = MOVIE_FIELDS + (
+    "released", "plot", "runtime", "languages", "countries", "budget",
+    "revenue", "imdbVotes", "url",
+)
+
+_ALL_TEMPLATE = textwrap.dedent("""
+    OPTIONAL MATCH (u:User {{userId: $user_id}})
+        -[:HAS_FAVORITE]->(fav)
+    WITH collect(fav.tmdbId) AS favorites
+    MATCH (m:Movie)
+    WHERE m.`{0}` IS NOT NULL
+    RETURN m {{
+        {2},
+        favorite: m.tmdbId IN favorites
+    }} AS movie
+    ORDER BY m.`{0}` {1}
+    SKIP $skip
+    LIMIT $limit
+""").strip()
+
+
+def _projection(fields):
+    """Build the map-projection entries for a whitelisted field set."""
+    unknown = [field for field in fields
+               if field not in _PROJECTABLE_FIELDS]
+    if unknown:
+        raise BadRequestException(
+            "Unsupported movie fields: {}".format(", ".join(unknown)))
+
+    return ", ".join(".{}".format(field) for field in fields)
+
+
+_ALL_QUERIES = {
+    (sort, order, MOVIE_FIELDS):
+        _ALL_TEMPLATE.format(sort, order, _projection(MOVIE_FIELDS))
+    for sort in MOVIE_SORTS for order in SORT_ORDERS
+}
+
+
+def _all_query(sort, order, fields=MOVIE_FIELDS):
+    """Look up (or build and memoize) the movie list statement for a
+    sort/order/fields combination."""
+    # The frontend sends lowercase directions
+    order = order.upper()
+    fields = tuple(fields)
+    try:
+        return _ALL_QUERIES[(sort, order, fields)]
+    except KeyError:
+        if sort not in MOVIE_SORTS or order not in SORT_ORDERS:
+            raise BadRequestException(
+                "Unsupported sort '{}' or order '{}'".format(sort, order))
+
+        cypher = _ALL_TEMPLATE.format(sort, order, _projection(fields))
+        _ALL_QUERIES[(sort, order, fields)] = cypher
+        return cypher
+
+
+# Keyset variant of the movie list query.  Instead of SKIP, the WHERE
+# clause seeks past the last row of the previous page using the sort
+# value plus tmdbId as a tie-breaker, so deep pages cost O(limit)
+# rather than O(skip + limit).  A null cursor returns the first page
+# from the same query text, keeping one cached plan per combination.
+# Each sort key wants a composite index on (m.<sort>, m.tmdbId) for
+# the seek to be index-backed.
+_ALL_AFTER_TEMPLATE = textwrap.dedent("""
+    OPTIONAL MATCH (u:User {{userId: $user_id}})
+        -[:HAS_FAVORITE]->(fav)
+    WITH collect(fav.tmdbId) AS favorites
+    MATCH (m:Movie)
+    WHERE m.`{0}` IS NOT NULL
+    AND (
+        $cursor_value IS NULL
+        OR m.`{0}` {2} $cursor_value
+        OR (m.`{0}` = $cursor_value AND m.tmdbId {2} $cursor_id)
+    )
+    RETURN m {{
+        {3},
+        favorite: m.tmdbId IN favorites
+    }} AS movie
+    ORDER BY m.`{0}` {1}, m.tmdbId {1}
+    LIMIT $limit
+""").strip()
+
+_ALL_AFTER_QUERIES = {
+    (sort, order, MOVIE_FIELDS):
+        _ALL_AFTER_TEMPLATE.format(sort, order,
+                                   ">" if order == "ASC" else "<",
+                                   _projection(MOVIE_FIELDS))
+    for sort in MOVIE_SORTS for order in SORT_ORDERS
+}
+
+
+# Movies that belong to a named genre, sharing the pagination and
+# favorites shape of the main list query
+_BY_GENRE_TEMPLATE = textwrap.dedent("""
+    OPTIONAL MATCH (u:User {{userId: $user_id}})
+        -[:HAS_FAVORITE]->(fav)
+    WITH collect(fav.tmdbId) AS favorites
+    MATCH (m:Movie)-[:IN_GENRE]->(:Genre {{name: $name}})
+    WHERE m.`{0}` IS NOT NULL
+    RETURN m {{
+        {2},
+        favorite: m.tmdbId IN favorites
+    }} AS movie
+    ORDER BY m.`{0}` {1}
+    SKIP $skip
+    LIMIT $limit
+""").strip()
+
+_BY_GENRE_QUERIES = {
+    (sort, order, MOVIE_FIELDS):
+        _BY_GENRE_TEMPLATE.format(sort, order, _projection(MOVIE_FIELDS))
+    for sort in MOVIE_SORTS for order in SORT_ORDERS
+}
+
+
+def _by_genre_query(sort, order, fields=MOVIE_FIELDS):
+    """Look up (or build and memoize) the genre movie list statement
+    for a sort/order/fields combination."""
+    # The frontend sends lowercase directions
+    order = order.upper()
+    fields = tuple(fields)
+    try:
+        return _BY_GENRE_QUERIES[(sort, order, fields)]
+    except KeyError:
+        if sort not in MOVIE_SORTS or order not in SORT_ORDERS:
+            raise BadRequestException(
+                "Unsupported sort '{}' or order '{}'".format(sort, order))
+
+        cypher = _BY_GENRE_TEMPLATE.format(sort, order, _projection(fields))
+        _BY_GENRE_QUERIES[(sort, order, fields)] = cypher
+        return cypher
+
+
+def _all_after_query(sort, order, fields=MOVIE_FIELDS):
+    """Look up (or build and memoize) the keyset movie list statement
+    for a sort/order/fields combination."""
+    # The frontend sends lowercase directions
+    order = order.upper()
+    fields = tuple(fields)
+    try:
+        return _ALL_AFTER_QUERIES[(sort, order, fields)]
+    except KeyError:
+        if sort not in MOVIE_SORTS or order not in SORT_ORDERS:
+            raise BadRequestException(
+                "Unsupported sort '{}' or order '{}'".format(sort, order))
+
+        cypher = _ALL_AFTER_TEMPLATE.format(sort, order,
+                                            ">" if order == "ASC" else "<",
+                                            _projection(fields))
+        _ALL_AFTER_QUERIES[(sort, order, fields)] = cypher
+        return cypher
+
+
+# Schema commands run by `ensure_indexes` on startup.  Every DAO query
+# filters on m.tmdbId or u.userId, so without the uniqueness
+# constraints those filters degrade to label scans; the composite
+# (sort, tmdbId) indexes back both the ORDER BY in `all` and the keyset
+# seek in `all_after`.
+_SCHEMA_STATEMENTS = (
+    "CREATE CONSTRAINT movie_tmdbid IF NOT EXISTS "
+    "FOR (m:Movie) REQUIRE m.tmdbId IS UNIQUE",
+    "CREATE CONSTRAINT user_userid IF NOT EXISTS "
+    "FOR (u:User) REQUIRE u.userId IS UNIQUE",
+) + tuple(
+    "CREATE INDEX movie_sort_{0} IF NOT EXISTS "
+    "FOR (m:Movie) ON (m.`{0}`, m.tmdbId)".format(sort)
+    for sort in MOVIE_SORTS
+)
+
+# Cypher evaluates `IN` by walking the list, so the favorite flag costs
+# O(len(favorites)) string comparisons per returned row.  Past this
+# threshold the favorites are shipped as a map instead and tested with
+# an O(1) key lookup.
+_FAVORITES_MAP_THRESHOLD = 32
+
+# Past this size the favorites are not sent over Bolt at all: the rows
+# are fetched without the flag and it is patched on in Python with an
+# O(1) set lookup per row, sparing the server and the wire entirely.
+_FAVORITES_CLIENT_THRESHOLD = 200
+
+
+def _favorite_variants(template):
+    """Build the list-parameter, map-parameter and client-side forms of
+    a statement whose favorite test is marked with the __FAVORITE__
+    placeholder.  The client-side form projects a constant which the
+    caller overwrites after fetching."""
+    return (
+        template.replace("__FAVORITE__", "m.tmdbId IN $favorites"),
+        template.replace("__FAVORITE__",
+                         "$favoriteSet[m.tmdbId] IS NOT NULL"),
+        template.replace("__FAVORITE__", "false"),
+    )
+
+
+def _favorites_strategy(favorites):
+    """Pick how the favorite flag is computed for a favorites list.
+
+    Returns a (variant, params, fav_set) triple: `variant` indexes into
+    the tuple built by `_favorite_variants`, `params` is splatted into
+    `tx.run`, and `fav_set` is a frozenset to patch the flag on
+    client-side -- or None when the flag is computed on the server.
+    """
+    if len(favorites) > _FAVORITES_CLIENT_THRESHOLD:
+        return 2, {}, frozenset(favorites)
+
+    if len(favorites) > _FAVORITES_MAP_THRESHOLD:
+        return 1, {"favoriteSet": {tid: True for tid in favorites}}, None
+
+    return 0, {"favorites": favorites}, None
+
+
+# Fixed Cypher statements used verbatim by the DAO, dedented once at
+# import time so method calls only do a name lookup
+_FAVORITES_QUERY = textwrap.dedent("""
+    MATCH (u:User {userId: $userId})-[:HAS_FAVORITE]->(m)
+    RETURN m.tmdbId AS id
+""").strip()
+
+_FIND_BY_IDS_TEMPLATE = textwrap.dedent("""
+    MATCH (m:Movie)
+    WHERE m.tmdbId IN $ids
+    RETURN m.tmdbId AS id, m {
+        .*,
+        actors: [
+            (a)-[r:ACTED_IN]->(m) | a { .*, role: r.role }
+        ],
+        directors: [ (d)-[:DIRECTED]->(m) | d { .* } ],
+        genres: [
+            (m)-[:IN_GENRE]->(g) | g {
+                link: '/genres/' + g.name, .name
+            }
+        ],
+        ratingCount: count { (m)<-[:RATED]-() },
+        favorite: __FAVORITE__
+    } AS movie
+""").strip()
+
+_FIND_BY_IDS_QUERIES = _favorite_variants(_FIND_BY_IDS_TEMPLATE)
+
+_SIMILAR_MANY_TEMPLATE = textwrap.dedent("""
+    UNWIND $ids AS id
+    MATCH (:Movie {tmdbId: id})
+        -[:IN_GENRE|ACTED_IN|DIRECTED]-()
+        -[:IN_GENRE|ACTED_IN|DIRECTED]-(m)
+    WHERE m.imdbRating IS NOT NULL AND m.tmdbId <> id
+    WITH id, m, count(*) AS inCommon
+    WITH id, m, inCommon, m.imdbRating * inCommon AS score
+    ORDER BY id, score DESC
+    WITH id, collect(m {
+        .*,
+        score: score,
+        favorite: __FAVORITE__
+    })[$skip..$skip + $limit] AS movies
+    RETURN id, movies
+""").strip()
+
+_SIMILAR_MANY_QUERIES = _favorite_variants(_SIMILAR_MANY_TEMPLATE)
+
+
+# The not-yet-implemented person methods page the `popular` fixture.
+# Pages are cached as tuples so repeat calls allocate nothing and
+# callers cannot append to or reorder the shared fixture list.
+_POPULAR_PAGE_CACHE = {}
+
+
+def _popular_page(skip, limit):
+    """Return a cached, immutable page of the `popular` fixture."""
+    return _POPULAR_PAGE_CACHE.setdefault((skip, limit),
+                                          tuple(popular[skip:limit]))
+
+
+def _encode_cursor(sort_value, tmdb_id):
+    """Pack the keyset position into an opaque URL-safe string."""
+    payload = json.dumps([sort_value, tmdb_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def _decode_cursor(cursor):
+    """Unpack a cursor created by `_encode_cursor`."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        sort_value, tmdb_id = json.loads(payload)
+    except (ValueError, TypeError):
+        raise BadRequestException("Malformed cursor")
+
+    return sort_value, tmdb_id
+
+
+def _cursor_fields(sort, fields):
+    """Extend a projection so the sort property is always present --
+    the next cursor is built from it on the last row of the page."""
+    fields = tuple(fields)
+    if sort in _PROJECTABLE_FIELDS and sort not in fields:
+        fields = fields + (sort,)
+
+    return fields
+
+
+def _next_cursor(movies, sort, limit):
+    """Build the cursor for the page following `movies`.  A short page
+    means the list is exhausted, so None is returned instead."""
+    if len(movies) < limit or len(movies) == 0:
+        return None
+
+    last = movies[-1]
+    return _encode_cursor(last.get(sort), last.get("tmdbId"))
 
 
 class MovieDAO:
@@ -10,12 +400,34 @@ class MovieDAO:
     def __init__(self, driver):
         self.driver = driver
 
+    def _session(self):
+        """Return the session cached for this thread, creating it (or
+        replacing one bound to a different driver) as needed."""
+        entry = getattr(_THREAD_SESSIONS, "entry", None)
+        if entry is not None:
+            if entry[0] is self.driver:
+                return entry[1]
+            entry[1].close()
+
+        session = self.driver.session()
+        _THREAD_SESSIONS.entry = (self.driver, session)
+        return session
+
+    def ensure_indexes(self):
+        """Create the uniqueness constraints and indexes the DAO
+        queries rely on.  Every statement uses IF NOT EXISTS, so this
+        is safe to call on every application startup."""
+        with self.driver.session() as session:
+            for statement in _SCHEMA_STATEMENTS:
+                session.run(statement).consume()
+
     def all(self,
             sort,
             order,
             limit=6,
             skip=0,
-            user_id=os.environ.get("USER_ID")):
+            user_id=None,
+            fields=MOVIE_FIELDS):
         """This method should return a paginated list of movies ordered by the
         `sort` parameter and limited to the number passed as `limit`.  The
         `skip` variable should be used to skip a certain number of rows.
@@ -23,39 +435,85 @@ class MovieDAO:
         If a user_id value is suppled, a `favorite` boolean property
         should be returned to signify whether the user has added the
         movie to their "My Favorites" list.
+
+        Only the properties named in `fields` are projected and sent
+        over Bolt; the default covers what the listing cards render.
         """
 
-        def get_movies(tx, sort, order, limit, skip, user_id):
-            # Get User favorites
-            favorites = self.get_user_favorites(tx, user_id)
+        # Look up the precomputed cypher statement for this sort/order
+        # combination.  The favorites lookup is folded into the query
+        # with an OPTIONAL MATCH so a single round-trip serves the
+        # whole page.
+        cypher = _all_query(sort, order, fields)
+
+        # Run the statement and extract the movie column in a single
+        # pass over the record buffer, without building intermediate
+        # objects per row
+        return _read(
+            self._session(),
+            lambda tx: tx.run(
+                cypher,
+                limit=limit,
+                skip=skip,
+                user_id=user_id).value("movie"),
+            op="movies.all")
+
+    def all_iter(self, sort, order, limit=1000, skip=0, user_id=None,
+                 fields=MOVIE_FIELDS):
+        """Streaming variant of `all` for large pages.  Yields one
+        movie projection at a time instead of buffering the whole page
+        into a list, so memory stays flat however large the limit is;
+        the driver fetches records from the server in batches as the
+        consumer advances.
+
+        A dedicated session backs the stream.  It stays open while the
+        generator is live and is closed when the generator is exhausted
+        or closed early.  Callers that want a list can simply wrap the
+        call in `list(...)`.
+        """
+        cypher = _all_query(sort, order, fields)
 
-            # Define the cypher statement
-            cypher = """
-                MATCH (m:Movie)
-                WHERE exists(m.`{0}`)
-                RETURN m {{
-                    .*,
-                    favorite: m.tmdbId IN $favorites
-                }} AS movie
-                ORDER BY m.`{0}` {1}
-                SKIP $skip
-                LIMIT $limit
-            """.format(sort, order)
-
-            # Run the statement within the transaction
-            # passed as the first argument
-            result = tx.run(
+        session = self.driver.session()
+        try:
+            result = session.run(
                 cypher,
                 limit=limit,
                 skip=skip,
+                user_id=user_id)
+            for record in result:
+                yield record.get("movie")
+        finally:
+            session.close()
+
+    def all_after(self, sort, order, cursor=None, limit=6, user_id=None,
+                  fields=MOVIE_FIELDS):
+        """Keyset-paginated variant of `all`.  Instead of a `skip`
+        count, the caller passes back the opaque `cursor` returned with
+        the previous page and the query seeks directly past that row.
+
+        Returns a dict with the `movies` for the page and the
+        `next_cursor` to request the following page, or None when the
+        end of the list has been reached.
+        """
+        cypher = _all_after_query(sort, order, _cursor_fields(sort, fields))
+
+        if cursor is not None:
+            cursor_value, cursor_id = _decode_cursor(cursor)
+        else:
+            cursor_value, cursor_id = None, None
+
+        movies = _read(
+            self._session(),
+            lambda tx: tx.run(
+                cypher,
+                limit=limit,
                 user_id=user_id,
-                favorites=favorites)
-            # Extract a list of Movies from the Result
-            return [row.value("movie") for row in result]
+                cursor_value=cursor_value,
+                cursor_id=cursor_id).value("movie"),
+            op="movies.all_after")
 
-        with self.driver.session() as session:
-            return session.execute_read(get_movies, sort, order, limit, skip,
-                                        user_id)
+        return {"movies": movies,
+                "next_cursor": _next_cursor(movies, sort, limit)}
 
     def get_by_genre(self,
                      name,
@@ -63,7 +521,8 @@ class MovieDAO:
                      order="ASC",
                      limit=6,
                      skip=0,
-                     user_id=None):
+                     user_id=None,
+                     fields=MOVIE_FIELDS):
         """This method should return a paginated list of movies that have a
         relationship to the supplied Genre.
 
@@ -76,34 +535,17 @@ class MovieDAO:
         returned to signify whether the user has added the movie to their
         "My Favorites" list.
         """
+        cypher = _by_genre_query(sort, order, fields)
 
-        def all(self):
-            # Define a unit of work to Get a list of Genres
-            def get_movies(tx):
-                result = tx.run("""
-                    MATCH (g:Genre)
-                    WHERE g.name <> '(no genres listed)'
-                    CALL {
-                        WITH g
-                        MATCH (g)<-[:IN_GENRE]-(m:Movie)
-                        WHERE m.imdbRating IS NOT NULL AND m.poster IS NOT NULL
-                        RETURN m.poster AS poster
-                        ORDER BY m.imdbRating DESC LIMIT 1
-                    }
-                    RETURN g {
-                        .*,
-                        movies: size((g)<-[:IN_GENRE]-(:Movie)),
-                        poster: poster
-                    } AS genre
-                    ORDER BY g.name ASC
-                """)
-
-                return [g.value(0) for g in result]
-
-            # Open a new session
-            with self.driver.session() as session:
-                # Execute within a Read Transaction
-                return session.execute_read(get_movies)
+        return _read(
+            self._session(),
+            lambda tx: tx.run(
+                cypher,
+                name=name,
+                limit=limit,
+                skip=skip,
+                user_id=user_id).value("movie"),
+            op="movies.get_by_genre")
 
     def get_for_actor(self,
                       id,
@@ -129,7 +571,7 @@ class MovieDAO:
         # escape the braces: {{tmdbId: $id}}
         # MATCH (:Person {tmdbId: $id})-[:ACTED_IN]->(m:Movie)
 
-        return popular[skip:limit]
+        return _popular_page(skip, limit)
 
     def get_for_director(self,
                          id,
@@ -155,7 +597,41 @@ class MovieDAO:
         # the braces: {{name: $name}}
         # MATCH (:Person {tmdbId: $id})-[:DIRECTED]->(m:Movie)
 
-        return popular[skip:limit]
+        return _popular_page(skip, limit)
+
+    def find_by_ids(self, ids, user_id=None):
+        """This method finds the Movie nodes with the tmdbIds passed as
+        the `ids` parameter in a single query, returning a dict keyed by
+        tmdbId.  Along with the returned payload, a list of actors,
+        directors, and genres is included per movie.  The number of
+        incoming RATED relationships is also returned as `ratingCount`.
+
+        If a user_id value is suppled, a `favorite` boolean property
+        should be returned to signify whether the user has added the
+        movie to their "My Favorites" list.
+        """
+
+        def get_movies(tx, ids, user_id):
+            favorites = self.get_user_favorites(tx, user_id)
+            variant, fav_params, fav_set = _favorites_strategy(favorites)
+
+            result = tx.run(
+                _FIND_BY_IDS_QUERIES[variant],
+                ids=ids,
+                **fav_params)
+
+            movies = {record.get("id"): record.get("movie")
+                      for record in result}
+
+            if fav_set is not None:
+                for movie in movies.values():
+                    movie["favorite"] = movie["tmdbId"] in fav_set
+
+            return movies
+
+        with self.driver.session() as session:
+            return _read(session, get_movies, ids, user_id,
+                         op="movies.find_by_ids")
 
     def find_by_id(self, id, user_id=None):
         """This method find a Movie node with the ID passed as the `id`
@@ -167,10 +643,51 @@ class MovieDAO:
         should be returned to signify whether the user has added the
         movie to their "My Favorites" list.
         """
-        # TODO: Find a movie by its ID
-        # MATCH (m:Movie {tmdbId: $id})
+        movies = self.find_by_ids([id], user_id)
+
+        if id not in movies:
+            raise NotFoundException()
+
+        return movies[id]
+
+    def get_similar_movies_many(self, ids, limit=6, skip=0, user_id=None):
+        """This method should return a paginated list of similar movies
+        for each of the Movie ids supplied, as a dict keyed by tmdbId.
+        Similarity is calculated by finding movies that have many first
+        degree connections in common: Actors, Directors and Genres.
+
+        The ids are expanded with UNWIND so one query and one execution
+        plan serve the whole batch.
+
+        If a user_id value is suppled, a `favorite` boolean property should be
+        returned to signify whether the user has added the movie to their
+        "My Favorites" list.
+        """
+
+        def get_similar(tx, ids, limit, skip, user_id):
+            favorites = self.get_user_favorites(tx, user_id)
+            variant, fav_params, fav_set = _favorites_strategy(favorites)
 
-        return goodfellas
+            result = tx.run(
+                _SIMILAR_MANY_QUERIES[variant],
+                ids=ids,
+                limit=limit,
+                skip=skip,
+                **fav_params)
+
+            similar = {record.get("id"): record.get("movies")
+                       for record in result}
+
+            if fav_set is not None:
+                for movies in similar.values():
+                    for movie in movies:
+                        movie["favorite"] = movie["tmdbId"] in fav_set
+
+            return similar
+
+        with self.driver.session() as session:
+            return _read(session, get_similar, ids, limit, skip, user_id,
+                         op="movies.get_similar")
 
     def get_similar_movies(self, id, limit=6, skip=0, user_id=None):
         """This method should return a paginated list of similar movies to the
@@ -187,21 +704,32 @@ class MovieDAO:
         returned to signify whether the user has added the movie to their
         "My Favorites" list.
         """
-        # TODO: Get similar movies from Neo4j
-
-        return popular[skip:limit]
+        return self.get_similar_movies_many([id], limit, skip,
+                                            user_id).get(id, [])
 
     def get_user_favorites(self, tx, user_id):
         """This function should return a list of tmdbId properties for the
-        movies that the user has added to their 'My Favorites' list."""
+        movies that the user has added to their 'My Favorites' list.
+
+        Results are cached for 60 seconds per user so back-to-back page
+        requests skip the round-trip to Neo4j entirely.
+        """
         if user_id is None:
             return []
 
-        result = tx.run(
-            """
-            MATCH (u:User {userId: $userId})-[:HAS_FAVORITE]->(m)
-            RETURN m.tmdbId AS id
-        """,
-            userId=user_id)
+        with _FAVORITES_LOCK:
+            if user_id in _FAVORITES_CACHE:
+                return _FAVORITES_CACHE[user_id]
+
+        result = tx.run(_FAVORITES_QUERY, userId=user_id)
+
+        favorites = [record.get("id") for record in result]
+
+        with _FAVORITES_LOCK:
+            _FAVORITES_CACHE[user_id] = favorites
+
+        return favorites
 
-        return [record.get("id") for record in result]
+    def invalidate_favorites(self, user_id):
+        """Drop the cached favorites list for a user."""
+        invalidate_favorites(user_id)
@@ -0,0 +1,85 @@
+from neo4j import unit_of_work
+from neo4j.exceptions import ClientError
+
+from api.dao.movies import MOVIE_FIELDS, _TX_TIMEOUT, _all_after_query, \
+    _all_query, _cursor_fields, _decode_cursor, _next_cursor
+from api.exceptions.unavailable import ServiceUnavailableException
+
+
+async def _read(session, work, *args, op=None, **kwargs):
+    """Async counterpart of `api.dao.movies._read`: run `work` as a
+    read transaction with the same timeout and query metadata, and
+    surface a server-terminated transaction as a 503."""
+    bounded = unit_of_work(
+        timeout=_TX_TIMEOUT,
+        metadata={"app": "movies", "op": op})(work)
+
+    try:
+        return await session.execute_read(bounded, *args, **kwargs)
+    except ClientError as exception:
+        if exception.code is not None and \
+                exception.code.startswith("Neo.ClientError.Transaction."):
+            raise ServiceUnavailableException(
+                "Query was cancelled or timed out, please retry")
+        raise
+
+
+class AsyncMovieDAO:
+    """Asynchronous counterpart to MovieDAO for the hot listing paths.
+
+    The constructor expects an instance of the Neo4j AsyncDriver,
+    created with `neo4j.AsyncGraphDatabase.driver`.  The blocking
+    MovieDAO remains the default for the Flask (WSGI) routes; this
+    class is for deployments served under ASGI, where a single worker
+    thread can overlap many Bolt round-trips instead of blocking on
+    each one.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def all(self, sort, order, limit=6, skip=0, user_id=None,
+                  fields=MOVIE_FIELDS):
+        """Async version of `MovieDAO.all`, serving a paginated list of
+        movies from the same precompiled query text."""
+        cypher = _all_query(sort, order, fields)
+
+        async def get_movies(tx, limit, skip, user_id):
+            result = await tx.run(
+                cypher,
+                limit=limit,
+                skip=skip,
+                user_id=user_id)
+            return await result.value("movie")
+
+        async with self.driver.session() as session:
+            return await _read(session, get_movies, limit, skip, user_id,
+                               op="movies.all")
+
+    async def all_after(self, sort, order, cursor=None, limit=6,
+                        user_id=None, fields=MOVIE_FIELDS):
+        """Async version of `MovieDAO.all_after`, returning a page of
+        movies plus the `next_cursor` for keyset pagination."""
+        cypher = _all_after_query(sort, order, _cursor_fields(sort, fields))
+
+        if cursor is not None:
+            cursor_value, cursor_id = _decode_cursor(cursor)
+        else:
+            cursor_value, cursor_id = None, None
+
+        async def get_movies(tx, limit, user_id, cursor_value, cursor_id):
+            result = await tx.run(
+                cypher,
+                limit=limit,
+                user_id=user_id,
+                cursor_value=cursor_value,
+                cursor_id=cursor_id)
+            return await result.value("movie")
+
+        async with self.driver.session() as session:
+            movies = await _read(session, get_movies, limit, user_id,
+                                 cursor_value, cursor_id,
+                                 op="movies.all_after")
+
+        return {"movies": movies,
+                "next_cursor": _next_cursor(movies, sort, limit)}
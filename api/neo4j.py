@@ -11,9 +11,25 @@ Initiate the Neo4j Driver
 # tag::initDriver[]
 
 
-def init_driver(uri, username, password):
-    # TODO: Create an instance of the driver here
-    current_app.driver = GraphDatabase.driver(uri, auth=(username, password))
+def init_driver(uri, username, password, pool_size=50,
+                acquisition_timeout=30):
+    """Create the driver with explicit connection-pool tuning.
+
+    The driver *is* the connection pool: it must be created once at
+    startup and shared process-wide. Creating a driver per request
+    throws the pool away each time. Under concurrent load the default
+    pool size silently serializes independent queries behind pool
+    waits, so the limits are spelled out here and can be raised by the
+    caller.
+    """
+    current_app.driver = GraphDatabase.driver(
+        uri,
+        auth=(username, password),
+        max_connection_pool_size=pool_size,
+        connection_acquisition_timeout=acquisition_timeout,
+        max_connection_lifetime=3600,
+        keep_alive=True,
+    )
 
     current_app.driver.verify_connectivity()
 
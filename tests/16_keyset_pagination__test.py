@@ -0,0 +1,60 @@
+import pytest
+
+from api.neo4j import get_driver
+from api.dao.movies import MovieDAO, _decode_cursor, _encode_cursor
+from api.exceptions.badrequest import BadRequestException
+
+
+def test_cursor_round_trip():
+    """Test that a cursor survives the encode/decode round-trip"""
+    cursor = _encode_cursor("Toy Story", "862")
+
+    assert isinstance(cursor, str)
+    assert _decode_cursor(cursor) == ("Toy Story", "862")
+
+
+def test_malformed_cursor_rejected():
+    """Test that a tampered cursor raises a Bad Request"""
+    with pytest.raises(BadRequestException):
+        _decode_cursor("not-a-cursor")
+
+
+def test_unknown_sort_or_order_rejected():
+    """Test that sort/order values outside the whitelist raise a Bad
+    Request before any query is sent"""
+    dao = MovieDAO(None)
+
+    with pytest.raises(BadRequestException):
+        dao.all("title; DROP CONSTRAINT movie_tmdbid", "ASC")
+
+    with pytest.raises(BadRequestException):
+        dao.all("title", "SIDEWAYS")
+
+    with pytest.raises(BadRequestException):
+        dao.all_after("title", "SIDEWAYS")
+
+
+def test_keyset_pagination(app):
+    """Test that all_after pages through the list without repeating or
+    reordering rows"""
+    with app.app_context():
+        driver = get_driver()
+
+        dao = MovieDAO(driver)
+
+        first = dao.all_after("title", "ASC", limit=2)
+        second = dao.all_after("title", "ASC",
+                               cursor=first["next_cursor"], limit=2)
+
+        assert len(first["movies"]) == 2
+        assert len(second["movies"]) == 2
+        assert first["next_cursor"] is not None
+
+        # The second page continues where the first left off
+        first_ids = {movie["tmdbId"] for movie in first["movies"]}
+        assert all(movie["tmdbId"] not in first_ids
+                   for movie in second["movies"])
+
+        titles = [movie["title"]
+                  for movie in first["movies"] + second["movies"]]
+        assert titles == sorted(titles)
@@ -0,0 +1,95 @@
+import asyncio
+
+from api.dao.movies import MOVIE_SORTS, _decode_cursor
+from api.dao.movies_async import AsyncMovieDAO
+
+
+class FakeResult:
+    def __init__(self, movies):
+        self._movies = movies
+
+    async def value(self, key):
+        return self._movies
+
+
+class FakeTransaction:
+    """Records the statement and parameters the DAO sends."""
+
+    def __init__(self, movies):
+        self._movies = movies
+        self.cypher = None
+        self.params = None
+
+    async def run(self, cypher, **params):
+        self.cypher = cypher
+        self.params = params
+        return FakeResult(self._movies)
+
+
+class FakeSession:
+    def __init__(self, tx):
+        self._tx = tx
+        self.work = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return False
+
+    async def execute_read(self, work, *args, **kwargs):
+        self.work = work
+        return await work(self._tx, *args, **kwargs)
+
+
+class FakeDriver:
+    def __init__(self, session):
+        self._session = session
+
+    def session(self):
+        return self._session
+
+
+def run_all_after(sort, movies, limit):
+    """Drive AsyncMovieDAO.all_after against the fakes and return the
+    output alongside the recorded transaction and session."""
+    tx = FakeTransaction(movies)
+    session = FakeSession(tx)
+    dao = AsyncMovieDAO(FakeDriver(session))
+
+    output = asyncio.run(dao.all_after(sort, "ASC", limit=limit))
+
+    return output, tx, session
+
+
+def test_cursor_built_for_every_sort_key():
+    """Test that every whitelisted sort key is projected so the next
+    cursor can be built from the last row of the page"""
+    for sort in MOVIE_SORTS:
+        movies = [{"tmdbId": str(n), sort: n} for n in range(2)]
+
+        output, tx, session = run_all_after(sort, movies, limit=2)
+
+        assert ".{}".format(sort) in tx.cypher
+        assert _decode_cursor(output["next_cursor"]) == (1, "1")
+
+
+def test_short_page_ends_pagination():
+    """Test that a page shorter than the limit returns no cursor"""
+    movies = [{"tmdbId": "1", "title": "Apollo 13"}]
+
+    output, tx, session = run_all_after("title", movies, limit=2)
+
+    assert output["movies"] == movies
+    assert output["next_cursor"] is None
+
+
+def test_transactions_are_bounded():
+    """Test that async reads carry the timeout and query metadata"""
+    movies = [{"tmdbId": "1", "title": "Apollo 13"}]
+
+    output, tx, session = run_all_after("title", movies, limit=2)
+
+    assert session.work.timeout == 2.0
+    assert session.work.metadata == {"app": "movies",
+                                     "op": "movies.all_after"}